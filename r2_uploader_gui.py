@@ -5,21 +5,28 @@ import urllib3
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QPushButton, QLabel, 
                             QVBoxLayout, QHBoxLayout, QWidget, QFileDialog, 
                             QTextEdit, QLineEdit, QMessageBox, QProgressBar,
-                            QProgressDialog, QTreeWidget, QTreeWidgetItem, QStyle,
-                            QMenu, QInputDialog, QSizePolicy, QStackedWidget, QListWidget, 
-                            QListWidgetItem, QSpinBox)
-from PyQt6.QtCore import Qt, QDateTime, QThread, pyqtSignal, QSize, QObject, QThreadPool, QByteArray
-from PyQt6.QtGui import QKeySequence, QShortcut, QIcon, QPixmap, QPainter
+                            QProgressDialog, QTreeView, QStyle,
+                            QMenu, QInputDialog, QSizePolicy, QStackedWidget, QListView, 
+                            QSpinBox)
+from PyQt6.QtCore import (Qt, QDateTime, QThread, pyqtSignal, QSize, QObject, QThreadPool, QByteArray,
+                          QAbstractTableModel, QModelIndex)
+from PyQt6.QtGui import QKeySequence, QShortcut, QIcon, QPixmap, QPainter, QTextCursor
 from PyQt6.QtSvgWidgets import QSvgWidget
 from PyQt6.QtSvg import QSvgRenderer
 import boto3
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import http.client
+import urllib3.connection
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
+from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 from PyQt6.QtGui import QClipboard
 import csv
 import time
-import math
+import mmap
+import threading
+from collections import deque
 
 # Windows 任务栏图标支持
 if sys.platform == 'win32':
@@ -52,9 +59,117 @@ APP_ICON_SVG = """
 </svg>
 """
 
+# 超过此大小的文件使用分片上传
+MULTIPART_THRESHOLD = 50 * 1024 * 1024
+
+# 分片上传并发数（每个在途分片占用一个分片大小的内存）
+MULTIPART_MAX_WORKERS = 16
+
+# 分片大小范围及对齐粒度，S3 单次分片上传最多 10000 个分片
+MIN_CHUNK_SIZE = 16 * 1024 * 1024
+MAX_CHUNK_SIZE = 256 * 1024 * 1024
+CHUNK_ALIGNMENT = 16 * 1024 * 1024
+MAX_MULTIPART_PARTS = 10000
+
+# 超过此大小的文件分片不小于 LARGE_FILE_MIN_CHUNK_SIZE，更大的文件按目标分片数放大分片
+LARGE_FILE_THRESHOLD = 100 * 1024 * 1024
+LARGE_FILE_MIN_CHUNK_SIZE = 64 * 1024 * 1024
+TARGET_MULTIPART_PARTS = 100
+
+# 进度信号最小发送间隔（纳秒），约30Hz，避免界面被大量重绘事件淹没
+PROGRESS_EMIT_INTERVAL_NS = 1_000_000_000 // 30
+
+# 上传速度刷新间隔（纳秒）
+SPEED_UPDATE_INTERVAL_NS = 500_000_000
+
+# 不超过此大小的文件直接 put_object 上传，不经过 s3transfer 的线程池调度
+# （put_object 不支持进度回调，阈值较小以免大文件上传期间进度条长时间不动）
+SMALL_FILE_PUT_THRESHOLD = 8 * 1024 * 1024
+
+# list_objects_v2 每页返回的对象数（服务端上限）
+LIST_PAGE_SIZE = 1000
+
+# 遍历对象列表（统计桶大小、删除目录）时同时在途的 list_objects_v2 请求数
+LISTING_MAX_WORKERS = 16
+
+# 并发遍历时切分键范围所用的分界字符（按码点升序），数字和字母按所属类别取用
+LISTING_SPLIT_ALPHABETS = ('0123456789', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+LISTING_SPLIT_CHARS = '-.0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+
+# 删除目录时同时在途的 DeleteObjects 批次数
+DELETE_MAX_WORKERS = 8
+
+# 文件大小的显示单位，相邻单位相差 1024 倍
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# 文件扩展名对应的标准图标，未列出的扩展名使用 SP_FileIcon
+FILE_ICON_MAP = {
+    # 图片文件
+    '.jpg': QStyle.StandardPixmap.SP_FileDialogDetailedView,
+    '.jpeg': QStyle.StandardPixmap.SP_FileDialogDetailedView,
+    '.png': QStyle.StandardPixmap.SP_FileDialogDetailedView,
+    '.gif': QStyle.StandardPixmap.SP_FileDialogDetailedView,
+    '.bmp': QStyle.StandardPixmap.SP_FileDialogDetailedView,
+    
+    # 文档文件
+    '.pdf': QStyle.StandardPixmap.SP_FileDialogInfoView,
+    '.doc': QStyle.StandardPixmap.SP_FileDialogInfoView,
+    '.docx': QStyle.StandardPixmap.SP_FileDialogInfoView,
+    '.txt': QStyle.StandardPixmap.SP_FileDialogInfoView,
+    
+    # 压缩文件
+    '.zip': QStyle.StandardPixmap.SP_DriveFDIcon,
+    '.rar': QStyle.StandardPixmap.SP_DriveFDIcon,
+    '.7z': QStyle.StandardPixmap.SP_DriveFDIcon,
+    
+    # 音视频文件
+    '.mp3': QStyle.StandardPixmap.SP_MediaVolume,
+    '.wav': QStyle.StandardPixmap.SP_MediaVolume,
+    '.mp4': QStyle.StandardPixmap.SP_MediaPlay,
+    '.avi': QStyle.StandardPixmap.SP_MediaPlay,
+    '.mov': QStyle.StandardPixmap.SP_MediaPlay,
+    
+    # 代码文件
+    '.py': QStyle.StandardPixmap.SP_FileDialogContentsView,
+    '.js': QStyle.StandardPixmap.SP_FileDialogContentsView,
+    '.html': QStyle.StandardPixmap.SP_FileDialogContentsView,
+    '.css': QStyle.StandardPixmap.SP_FileDialogContentsView,
+}
+
+# 文件列表中修改时间的显示格式
+LAST_MODIFIED_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 待上传文件列表最多显示的文件数
+PENDING_FILES_DISPLAY_LIMIT = 500
+
+# 请求重试策略：standard 模式对 5xx、限流和网络错误按指数退避（带随机抖动）重试。
+# 分片上传的每个分片都是独立请求，单个分片失败只会重传该分片，不会中止整个上传。
+RETRY_CONFIG = {'max_attempts': 5, 'mode': 'standard'}
+
+# HTTP 连接池大小（需大于分片上传、并发遍历和并发删除的线程数）
+MAX_POOL_CONNECTIONS = 64
+
+# 每次 send() 写入套接字的块大小，默认 8 KiB 会导致大量小块系统调用
+HTTP_BLOCKSIZE = 1024 * 1024
+
+# 进程内共享的 boto3 会话，再次创建客户端时可复用已加载的服务描述
+_session = boto3.session.Session()
+
 # 禁用 SSL 警告
 warnings.filterwarnings('ignore', category=urllib3.exceptions.InsecureRequestWarning)
 
+# 增大 HTTP 写缓冲区，减少分片上传时的系统调用次数
+http.client.HTTPConnection.__init__.__defaults__ = tuple(
+    HTTP_BLOCKSIZE if default == 8192 else default
+    for default in http.client.HTTPConnection.__init__.__defaults__
+)
+# urllib3 2.x 的 HTTPConnection 和 HTTPSConnection 各自带有 blocksize 关键字参数默认值，
+# 并总是显式传给 http.client，因此两者都需要修改（boto3 访问 R2 走的是 HTTPS）
+for _connection_cls in (urllib3.connection.HTTPConnection, urllib3.connection.HTTPSConnection):
+    _urllib3_kwdefaults = _connection_cls.__init__.__kwdefaults__
+    if _urllib3_kwdefaults and 'blocksize' in _urllib3_kwdefaults:
+        _urllib3_kwdefaults['blocksize'] = HTTP_BLOCKSIZE
+
 # ═══════════════════════════════════════════════════════════
 # 深色主题样式表
 # ═══════════════════════════════════════════════════════════
@@ -144,7 +259,7 @@ QProgressBar::chunk {
 }
 
 /* 树形控件 */
-QTreeWidget {
+QTreeView {
     background: #1C1C1E;
     color: #FFFFFF;
     border: 1px solid #2C2C2E;
@@ -156,16 +271,16 @@ QTreeWidget {
     outline: none;
 }
 
-QTreeWidget::item {
+QTreeView::item {
     padding: 8px;
     border-radius: 8px;
 }
 
-QTreeWidget::item:hover {
+QTreeView::item:hover {
     background: rgba(255,255,255,0.07);
 }
 
-QTreeWidget::item:selected {
+QTreeView::item:selected {
     background: #E8623A;
 }
 
@@ -179,7 +294,7 @@ QHeaderView::section {
 }
 
 /* 列表控件 */
-QListWidget {
+QListView {
     background: #1C1C1E;
     color: #FFFFFF;
     border: 1px solid #2C2C2E;
@@ -190,16 +305,16 @@ QListWidget {
     outline: none;
 }
 
-QListWidget::item {
+QListView::item {
     padding: 8px;
     border-radius: 8px;
 }
 
-QListWidget::item:hover {
+QListView::item:hover {
     background: rgba(255,255,255,0.07);
 }
 
-QListWidget::item:selected {
+QListView::item:selected {
     background: #E8623A;
 }
 
@@ -334,188 +449,358 @@ QSpinBox::down-arrow {
 }
 """
 
+def iter_folder_files(folder_path):
+    """用 os.scandir 递归遍历文件夹，逐个返回 (DirEntry, 相对路径)"""
+    pending_dirs = [folder_path]
+    while pending_dirs:
+        current_dir = pending_dirs.pop()
+        with os.scandir(current_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending_dirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry, os.path.relpath(entry.path, folder_path)
+
+def load_r2_config():
+    """从 .env 文件和环境变量读取 R2 配置"""
+    load_dotenv()  # 加载 .env 文件
+    return {
+        'account_id': os.getenv('R2_ACCOUNT_ID'),
+        'access_key_id': os.getenv('R2_ACCESS_KEY_ID'),
+        'access_key_secret': os.getenv('R2_ACCESS_KEY_SECRET'),
+        'bucket_name': os.getenv('R2_BUCKET_NAME'),
+        'endpoint_url': os.getenv('R2_ENDPOINT_URL'),
+        'custom_domain': os.getenv('R2_CUSTOM_DOMAIN'),
+        'public_domain': os.getenv('R2_PUBLIC_DOMAIN'),
+    }
+
+def create_r2_client(endpoint_url, access_key_id, access_key_secret):
+    """从进程共享的会话创建 R2 客户端（客户端本身可在多个线程间共享）"""
+    return _session.client(
+        service_name='s3',
+        endpoint_url=endpoint_url,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=access_key_secret,
+        config=Config(
+            signature_version='s3v4',
+            retries=RETRY_CONFIG,
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True  # 保持分片上传间隙的空闲连接
+        ),
+        region_name='auto',
+        verify=False
+    )
+
+def paginate_objects(s3_client, bucket_name, **kwargs):
+    """分页遍历 list_objects_v2：每页取满，且不返回用不到的对象所有者信息"""
+    paginator = s3_client.get_paginator('list_objects_v2')
+    return paginator.paginate(
+        Bucket=bucket_name,
+        FetchOwner=False,
+        PaginationConfig={'PageSize': LIST_PAGE_SIZE},
+        **kwargs
+    )
+
+def _split_chars_after(char):
+    """返回与 char 同类（数字、大写字母、小写字母）且排在它之后的分界字符"""
+    for chars in LISTING_SPLIT_ALPHABETS:
+        if char in chars:
+            break
+    else:
+        chars = LISTING_SPLIT_CHARS
+    return [c for c in chars if c > char]
+
+def split_key_range(prefix, first_key, last_key, stop_key):
+    """把尚未遍历的键范围 (last_key, stop_key] 切分为多个连续的子范围
+
+    first_key 和 last_key 是刚取得的一页中的首尾键。从它们开始不同的位置起逐位
+    向前，在每一位上取排在 last_key 该位字符之后的同类字符作为分界键，最多切出
+    LISTING_MAX_WORKERS 个分界。各子范围首尾相接，合起来恰好覆盖原范围，分界
+    字符只影响切分是否均匀，不会遗漏任何键。stop_key 为 None 表示直到前缀末尾。
+    """
+    diverge = len(prefix)
+    limit = min(len(first_key), len(last_key))
+    while diverge < limit and first_key[diverge] == last_key[diverge]:
+        diverge += 1
+
+    bounds = [last_key]
+    # 越靠前的位上的分界键越大，依次追加即保持升序
+    for pos in range(diverge, len(prefix) - 1, -1):
+        if pos < len(last_key):
+            level = [last_key[:pos] + c for c in _split_chars_after(last_key[pos])]
+        else:
+            level = [last_key + c for c in LISTING_SPLIT_CHARS]
+        for bound in level:
+            if stop_key is not None and bound >= stop_key:
+                break
+            bounds.append(bound)
+        if len(bounds) > LISTING_MAX_WORKERS:
+            del bounds[LISTING_MAX_WORKERS + 1:]
+            break
+    bounds.append(stop_key)
+    return list(zip(bounds, bounds[1:]))
+
+def paginate_concurrently(s3_client, bucket_name, prefix, page_handler, cancel_event=None):
+    """并发遍历前缀下的所有对象，每取得一页就调用一次 page_handler(page)
+
+    每个任务用 StartAfter 列出键范围 (start_key, stop_key] 中的一页。一页未取完
+    且线程池还有空闲时，把剩余范围按键切分成多个子范围并发遍历，因此不论对象
+    位于根目录、同一个目录还是分散在多个目录中，都能有多个 list_objects_v2
+    请求同时在途。page_handler 会在多个线程中被调用，需要自行保证线程安全。
+    cancel_event（threading.Event）被设置后不再发出新的请求，尽快返回。
+    """
+    def list_range(start_key, stop_key):
+        """列出范围内的一页，范围未取完时返回本页的首尾键，否则返回 None"""
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        kwargs = {'StartAfter': start_key} if start_key is not None else {}
+        response = s3_client.list_objects_v2(
+            Bucket=bucket_name,
+            Prefix=prefix,
+            MaxKeys=LIST_PAGE_SIZE,
+            FetchOwner=False,
+            **kwargs
+        )
+        contents = response.get('Contents', [])
+        in_range = contents
+        if stop_key is not None:
+            in_range = [obj for obj in contents if obj['Key'] <= stop_key]
+        if in_range:
+            page_handler(dict(response, Contents=in_range))
+
+        if not response.get('IsTruncated') or not in_range or len(in_range) < len(contents):
+            return None
+        return in_range[0]['Key'], in_range[-1]['Key']
+
+    # 所有任务共用同一个 s3_client
+    with ThreadPoolExecutor(max_workers=LISTING_MAX_WORKERS) as executor:
+        pending = {executor.submit(list_range, None, None): None}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stop_key = pending.pop(future)
+                page_keys = future.result()
+                if page_keys is None or (cancel_event is not None and cancel_event.is_set()):
+                    continue
+
+                first_key, last_key = page_keys
+                if len(pending) < LISTING_MAX_WORKERS:
+                    ranges = split_key_range(prefix, first_key, last_key, stop_key)
+                else:
+                    ranges = [(last_key, stop_key)]
+                for start, stop in ranges:
+                    pending[executor.submit(list_range, start, stop)] = stop
+
+def pick_chunk_size(total_size):
+    """根据文件大小选择分片大小
+
+    把文件分成约 100 个分片，不超过 100MiB 的文件分片不小于 16MiB，更大的文件不小于
+    64MiB，最大 256MiB（例如 1GiB 用 64MiB，10GiB 用 112MiB，25GiB 以上用 256MiB）。
+    同时保证分片数不超过 10000 个，最后向上对齐到 16MiB 的整数倍。
+    """
+    min_chunk_size = LARGE_FILE_MIN_CHUNK_SIZE if total_size > LARGE_FILE_THRESHOLD else MIN_CHUNK_SIZE
+    chunk_size = -(-total_size // TARGET_MULTIPART_PARTS)
+    chunk_size = max(min_chunk_size, min(MAX_CHUNK_SIZE, chunk_size))
+    chunk_size = max(chunk_size, -(-total_size // MAX_MULTIPART_PARTS))
+    return -(-chunk_size // CHUNK_ALIGNMENT) * CHUNK_ALIGNMENT
+
+def create_transfer_config(total_size, max_concurrency=MULTIPART_MAX_WORKERS):
+    """创建上传使用的传输配置
+
+    大于50MB自动分片，分片由 s3transfer 并发上传。每个分片在负责上传它的
+    工作线程中按需读取，磁盘读取与网络上传相互重叠，同时在途的分片数由
+    max_concurrency 限制。
+    """
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=pick_chunk_size(total_size),
+        max_concurrency=max_concurrency,
+        use_threads=True
+    )
+
+class ThrottledProgressCallback:
+    """上传进度回调：累计已上传字节数，按间隔限制进度和速度的发送频率
+
+    s3transfer 会在多个工作线程中同时调用回调，因此累计过程需要加锁。
+    """
+    __slots__ = (
+        'total', 'uploaded', 'last_ns', 'last_speed_ns', 'last_speed_uploaded',
+        'interval_ns', 'progress_sig', 'speed_sig', 'lock'
+    )
+
+    def __init__(self, total, progress_sig, speed_sig, interval_ns=PROGRESS_EMIT_INTERVAL_NS):
+        self.total = total
+        self.uploaded = 0
+        self.last_ns = 0
+        self.last_speed_ns = time.monotonic_ns()
+        self.last_speed_uploaded = 0
+        self.interval_ns = interval_ns
+        self.progress_sig = progress_sig
+        self.speed_sig = speed_sig
+        self.lock = threading.Lock()
+
+    def __call__(self, bytes_amount):
+        with self.lock:
+            current_ns = time.monotonic_ns()
+            self.uploaded += bytes_amount
+
+            # 更新进度（限制发送频率，上传完成时总是发送）
+            if current_ns - self.last_ns >= self.interval_ns or self.uploaded >= self.total:
+                self.progress_sig(self.uploaded * 100 // self.total if self.total else 100)
+                self.last_ns = current_ns
+
+            # 按上次采样以来上传的字节数计算速度
+            time_diff_ns = current_ns - self.last_speed_ns
+            if time_diff_ns >= SPEED_UPDATE_INTERVAL_NS:
+                self.speed_sig((self.uploaded - self.last_speed_uploaded) * 1e9 / time_diff_ns)
+                self.last_speed_ns = current_ns
+                self.last_speed_uploaded = self.uploaded
+
 class UploadThread(QThread):
     progress_updated = pyqtSignal(int)
     status_updated = pyqtSignal(str, bool)
     speed_updated = pyqtSignal(float)
     upload_finished = pyqtSignal(bool, str)
 
-    def __init__(self, s3_client, bucket_name, local_path, r2_key):
-        super().__init__()
+    def __init__(self, s3_client, bucket_name, local_path, r2_key, parent=None, check_replaced=False,
+                 max_concurrency=MULTIPART_MAX_WORKERS):
+        super().__init__(parent)
         self.s3_client = s3_client
         self.bucket_name = bucket_name
         self.local_path = local_path
         self.r2_key = r2_key
-        self.is_cancelled = False
-        self.last_time = time.time()
-        self.last_uploaded = 0
         self.total_size = os.path.getsize(local_path)
-
-    def _create_callback(self):
-        """创建上传进度回调"""
-        def callback(bytes_amount):
-            current_time = time.time()
-            self.last_uploaded += bytes_amount
-            
-            # 更新进度
-            percentage = (self.last_uploaded / self.total_size) * 100
-            self.progress_updated.emit(int(percentage))
-            
-            # 计算并更新速度
-            time_diff = current_time - self.last_time
-            if time_diff >= 0.5:  # 每0.5秒更新一次速度
-                speed = bytes_amount / time_diff
-                self.speed_updated.emit(speed)
-                self.last_time = current_time
-            
-            return not self.is_cancelled
-            
-        return callback
+        # 单个文件分片上传的并发数，文件夹并发上传时按文件数缩小以免超出连接池
+        self.max_concurrency = max_concurrency
+        # 是否在上传前查询将被覆盖的同名对象；replaced_size 为 0 表示不存在，None 表示未知
+        self.check_replaced = check_replaced
+        self.replaced_size = None
 
     def run(self):
         try:
-            callback = self._create_callback()
-            
-            if self.total_size > 50 * 1024 * 1024:  # 大于50MB使用分片上传
-                self._upload_large_file(callback)
+            if self.check_replaced:
+                self.replaced_size = self._get_replaced_size()
+            callback = ThrottledProgressCallback(
+                self.total_size, self.progress_updated.emit, self.speed_updated.emit
+            )
+            if self.total_size <= SMALL_FILE_PUT_THRESHOLD:
+                self._put_small_file(callback)
             else:
                 self.s3_client.upload_file(
                     self.local_path,
                     self.bucket_name,
                     self.r2_key,
-                    Callback=callback
+                    Callback=callback,
+                    Config=create_transfer_config(self.total_size, self.max_concurrency)
                 )
 
             self.upload_finished.emit(True, f"文件上传成功：{os.path.basename(self.local_path)}")
         except Exception as e:
             self.upload_finished.emit(False, f"上传失败：{str(e)}")
 
-    def _upload_large_file(self, progress_callback):
-        chunk_size = 20 * 1024 * 1024  # 20MB
+    def _get_replaced_size(self):
+        """查询将被覆盖的同名对象大小，不存在时返回 0，查询失败时返回 None"""
         try:
-            mpu = self.s3_client.create_multipart_upload(
-                Bucket=self.bucket_name,
-                Key=self.r2_key
-            )
-
-            parts = []
-            uploaded = 0
-            
-            with open(self.local_path, 'rb') as f:
-                part_number = 1
-                while True:
-                    data = f.read(chunk_size)
-                    if not data:
-                        break
-
-                    response = self.s3_client.upload_part(
-                        Bucket=self.bucket_name,
-                        Key=self.r2_key,
-                        PartNumber=part_number,
-                        UploadId=mpu['UploadId'],
-                        Body=data
-                    )
+            return self.s3_client.head_object(Bucket=self.bucket_name, Key=self.r2_key)['ContentLength']
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+                return 0
+        except Exception:
+            pass
+        return None
+
+    def _put_small_file(self, progress_callback):
+        """小文件用 mmap 映射后直接 put_object，避免先读入 Python bytes 再发送"""
+        with open(self.local_path, 'rb') as f:
+            if self.total_size == 0:
+                # 空文件无法 mmap
+                self.s3_client.put_object(Bucket=self.bucket_name, Key=self.r2_key, Body=b'')
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as body:
+                    self.s3_client.put_object(Bucket=self.bucket_name, Key=self.r2_key, Body=body)
 
-                    parts.append({
-                        'PartNumber': part_number,
-                        'ETag': response['ETag']
-                    })
+        progress_callback(self.total_size)
 
-                    uploaded += len(data)
-                    progress_callback(len(data))
-                    part_number += 1
+class FolderScanThread(QThread):
+    """在后台线程中遍历待上传的文件夹，统计文件数量和大小"""
+    scan_finished = pyqtSignal(str, list, object)  # 文件夹路径, [(相对路径, 大小), ...], 总大小
+    scan_failed = pyqtSignal(str, str)  # 文件夹路径, 错误信息
 
-            self.s3_client.complete_multipart_upload(
-                Bucket=self.bucket_name,
-                Key=self.r2_key,
-                UploadId=mpu['UploadId'],
-                MultipartUpload={'Parts': parts}
-            )
+    def __init__(self, folder_path, parent=None):
+        super().__init__(parent)
+        self.folder_path = folder_path
 
+    def run(self):
+        try:
+            total_size = 0
+            file_list = []
+            for entry, relative_path in iter_folder_files(self.folder_path):
+                size = entry.stat().st_size  # DirEntry 会缓存 stat 结果
+                total_size += size
+                file_list.append((relative_path, size))
+
+            # 按照文件大小降序排序
+            file_list.sort(key=lambda x: x[1], reverse=True)
+            self.scan_finished.emit(self.folder_path, file_list, total_size)
         except Exception as e:
-            try:
-                self.s3_client.abort_multipart_upload(
-                    Bucket=self.bucket_name,
-                    Key=self.r2_key,
-                    UploadId=mpu['UploadId']
-                )
-            except:
-                pass
-            raise e
-
-class UploadProgressCallback:
-    def __init__(self, total_size, progress_callback, status_callback, speed_callback):
-        self.total_size = total_size
-        self.uploaded = 0
-        self.last_time = time.time()
-        self.last_uploaded = 0
-        self.progress_callback = progress_callback
-        self.status_callback = status_callback
-        self.speed_callback = speed_callback
-        self.update_interval = 0.1  # 更新间隔（秒）
-
-    def __call__(self, bytes_amount):
-        self.uploaded += bytes_amount
-        current_time = time.time()
-        time_diff = current_time - self.last_time
-
-        # 控制更新频率
-        if time_diff >= self.update_interval:
-            percentage = (self.uploaded / self.total_size) * 100
-            self.progress_callback(int(percentage))
-
-            # 计算速度
-            speed = (self.uploaded - self.last_uploaded) / time_diff
-            self.speed_callback(speed)
-
-            # 只在100%时发送状态更新
-            if percentage >= 100:
-                self.status_callback(f"上传完成 - {percentage:.1f}%", False)
-
-            self.last_time = current_time
-            self.last_uploaded = self.uploaded
-
-        return True
-
-class UploadWorker:
-    def __init__(self, parent):
-        self.parent = parent
-        self.last_time = time.time()
-        self.last_uploaded = 0
-
-    def __call__(self, bytes_amount):
-        current_time = time.time()
-        self.last_uploaded += bytes_amount
-        
-        # 更新进度
-        if hasattr(self.parent, 'progress_bar'):
-            percentage = (self.last_uploaded / self.total_size) * 100 if hasattr(self, 'total_size') else 0
-            self.parent.progress_bar.setValue(int(percentage))
-        
-        # 计算并更新速度
-        time_diff = current_time - self.last_time
-        if time_diff >= 0.5:  # 每0.5秒更新一次速度
-            speed = bytes_amount / time_diff
-            if hasattr(self.parent, 'update_upload_info'):
-                self.parent.update_upload_info(
-                    os.path.dirname(self.file_path) if hasattr(self, 'file_path') else '',
-                    self.total_files if hasattr(self, 'total_files') else 1,
-                    self.uploaded_files if hasattr(self, 'uploaded_files') else 0,
-                    os.path.basename(self.file_path) if hasattr(self, 'file_path') else '',
-                    self.total_size if hasattr(self, 'total_size') else 0,
-                    speed
-                )
-            self.last_time = current_time
-        
-        return True
-
-    def set_file_info(self, file_path, total_size, part_number=None, total_parts=None):
-        self.file_path = file_path
-        self.total_size = total_size
-        self.part_number = part_number
-        self.total_parts = total_parts
-        self.last_uploaded = 0
-        self.last_time = time.time()
+            self.scan_failed.emit(self.folder_path, str(e))
+
+class R2ListModel(QAbstractTableModel):
+    """文件列表数据模型，列表视图和图标视图共用
+
+    各列数据分别存放在并行的元组中，刷新时整体替换，只触发一次模型重置，
+    视图只渲染可见的行。
+    """
+    HEADERS = ('名称', '类型', '大小', '修改时间')
+    # 对象键使用 UserRole，条目类型（'file' 或 'directory'）使用 KIND_ROLE，文件字节数使用 SIZE_ROLE
+    KIND_ROLE = Qt.ItemDataRole.UserRole + 1
+    SIZE_ROLE = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._set_columns(())
+
+    def _set_columns(self, rows):
+        """把 (键, 名称, 类型, 文件类型, 图标, 大小, 修改时间, 字节数) 行拆分为按列存放的元组"""
+        (self._keys, self._names, self._kinds, self._types,
+         self._icons, self._sizes, self._modified, self._byte_sizes) = tuple(zip(*rows)) or ((),) * 8
+        self._display_columns = (self._names, self._types, self._sizes, self._modified)
+
+    def set_rows(self, rows):
+        """整体替换模型数据"""
+        self.beginResetModel()
+        self._set_columns(rows)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_rows(())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display_columns[index.column()][row]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icons[row] if index.column() == 0 else None
+        if role == Qt.ItemDataRole.UserRole:
+            return self._keys[row]
+        if role == self.KIND_ROLE:
+            return self._kinds[row]
+        if role == self.SIZE_ROLE:
+            return self._byte_sizes[row]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
 
 class R2UploaderGUI(QMainWindow):
     def __init__(self):
@@ -523,6 +808,36 @@ class R2UploaderGUI(QMainWindow):
         # 初始化线程相关的属性
         self.bucket_size_thread = None
         self.bucket_size_worker = None
+        self.bucket_size_pending = False
+        # 最近一次统计得到的桶大小，之后的上传、删除按增减量更新；None 表示尚未统计完成
+        self._bucket_size_bytes = None
+        self.upload_thread = None
+        self.folder_upload_threads = set()
+        self.folder_pending_files = deque()
+        self.folder_max_concurrency = MULTIPART_MAX_WORKERS
+        # 最近一次选择文件夹时的遍历结果 (文件夹路径, 文件列表)，上传时直接复用
+        self.folder_scan_result = None
+        # 上传前仍在遍历文件夹的线程（选择文件夹后遍历尚未完成就开始上传时使用）
+        self.folder_upload_scan_thread = None
+
+        # 用到的系统标准图标只向样式查询一次
+        self._icon_cache = {
+            sp: self.style().standardIcon(sp)
+            for sp in (
+                QStyle.StandardPixmap.SP_DirIcon,
+                QStyle.StandardPixmap.SP_FileIcon,
+                QStyle.StandardPixmap.SP_FileDialogDetailedView,
+                QStyle.StandardPixmap.SP_FileDialogInfoView,
+                QStyle.StandardPixmap.SP_DriveFDIcon,
+                QStyle.StandardPixmap.SP_MediaVolume,
+                QStyle.StandardPixmap.SP_MediaPlay,
+                QStyle.StandardPixmap.SP_FileDialogContentsView,
+            )
+        }
+
+        # 文件列表行中不随对象变化的部分：目录行只有键和名称不同，文件行按扩展名缓存
+        self._dir_row_template = ('directory', '目录', self._icon_cache[QStyle.StandardPixmap.SP_DirIcon], '', '', 0)
+        self._file_row_templates = {}
         
         # 然后再初始化其他内容
         self.init_r2_client()
@@ -532,30 +847,26 @@ class R2UploaderGUI(QMainWindow):
 
     def init_r2_client(self):
         """初始化 R2 客户端"""
-        load_dotenv()  # 加载 .env 文件
+        config = load_r2_config()
         
-        self.account_id = os.getenv('R2_ACCOUNT_ID')
-        self.access_key_id = os.getenv('R2_ACCESS_KEY_ID')
-        self.access_key_secret = os.getenv('R2_ACCESS_KEY_SECRET')
-        self.bucket_name = os.getenv('R2_BUCKET_NAME')
-        self.endpoint_url = os.getenv('R2_ENDPOINT_URL')
+        self.account_id = config['account_id']
+        self.access_key_id = config['access_key_id']
+        self.access_key_secret = config['access_key_secret']
+        self.bucket_name = config['bucket_name']
+        self.endpoint_url = config['endpoint_url']
+        # 分享链接使用的域名，只在启动时读取一次
+        self.custom_domain = config['custom_domain']
+        self.public_domain = config['public_domain']
 
         if not all([self.account_id, self.access_key_id, self.access_key_secret, 
                     self.bucket_name, self.endpoint_url]):
             QMessageBox.warning(self, '配置错误', '请确保已正确配置 R2 凭证！')
             return
 
-        self.s3_client = boto3.client(
-            service_name='s3',
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=self.access_key_id,
-            aws_secret_access_key=self.access_key_secret,
-            config=Config(
-                signature_version='s3v4',
-                retries={'max_attempts': 3},
-            ),
-            region_name='auto',
-            verify=False
+        self.s3_client = create_r2_client(
+            self.endpoint_url,
+            self.access_key_id,
+            self.access_key_secret
         )
 
     def init_ui(self):
@@ -686,23 +997,30 @@ class R2UploaderGUI(QMainWindow):
         # 修改文件列表组件,添加图标视图
         self.stack_widget = QStackedWidget()
         
+        # 两个视图共用同一个数据模型
+        self.file_model = R2ListModel(self)
+
         # 表视图
-        self.file_list = QTreeWidget()
-        self.file_list.setHeaderLabels(['名称', '类型', '大小', '修改时间'])
+        self.file_list = QTreeView()
+        self.file_list.setUniformRowHeights(True)
+        self.file_list.setModel(self.file_model)
         self.file_list.setColumnWidth(0, 300)
-        self.file_list.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.file_list.doubleClicked.connect(self.on_item_double_clicked)
         
         # 图标视图 
-        self.icon_list = QListWidget()
-        self.icon_list.setViewMode(QListWidget.ViewMode.IconMode)
+        self.icon_list = QListView()
+        self.icon_list.setModel(self.file_model)
+        self.icon_list.setViewMode(QListView.ViewMode.IconMode)
         self.icon_list.setIconSize(QSize(96, 96))
         self.icon_list.setSpacing(40)
-        self.icon_list.setResizeMode(QListWidget.ResizeMode.Adjust)
-        self.icon_list.setMovement(QListWidget.Movement.Static)
+        self.icon_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.icon_list.setMovement(QListView.Movement.Static)
         self.icon_list.setGridSize(QSize(200, 160))
         self.icon_list.setWordWrap(True)
         self.icon_list.setUniformItemSizes(True)
-        self.icon_list.itemDoubleClicked.connect(self.on_icon_double_clicked)
+        # 条目较多时分批布局，避免一次性布局全部图标阻塞界面
+        self.icon_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.icon_list.doubleClicked.connect(self.on_icon_double_clicked)
         
         self.stack_widget.addWidget(self.file_list)
         self.stack_widget.addWidget(self.icon_list)
@@ -766,161 +1084,158 @@ class R2UploaderGUI(QMainWindow):
             self.show_pending_files(folder_path)
 
     def show_pending_files(self, folder_path):
-        """显示待上传的文列表"""
-        try:
-            total_size = 0
-            file_list = []
-            
-            # 遍历文件夹获取所有文件信息
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, folder_path)
-                    size = os.path.getsize(file_path)
-                    total_size += size
-                    file_list.append((relative_path, size))
-
-            # 格式化显示信息
-            info_text = f"文件夹路径：{folder_path}\n"
-            info_text += f"总文件数：{len(file_list)} 个\n"
-            info_text += f"总大小：{total_size / 1024 / 1024:.2f} MB\n\n"
-            info_text += "待上传文件列表：\n"
-            info_text += "-" * 50 + "\n"
-            
-            # 添加文件列表，按照文件大小降序排序
-            for relative_path, size in sorted(file_list, key=lambda x: x[1], reverse=True):
-                info_text += f"📄 {relative_path}\n"
-                info_text += f"   大小：{size / 1024 / 1024:.2f} MB\n"
-            
-            self.current_file_info.setText(info_text)
+        """显示待上传的文件列表（在后台线程中遍历文件夹）"""
+        self.current_file_info.setPlainText(f"文件夹路径：{folder_path}\n正在统计待上传文件...")
+
+        # 线程以窗口为父对象，结束后自行释放，重复选择文件夹时不会提前销毁仍在运行的线程
+        scan_thread = FolderScanThread(folder_path, self)
+        scan_thread.scan_finished.connect(self._on_folder_scanned)
+        scan_thread.scan_failed.connect(self._on_folder_scan_failed)
+        scan_thread.finished.connect(scan_thread.deleteLater)
+        scan_thread.start()
+
+    def _on_folder_scan_failed(self, folder_path, message):
+        """待上传文件夹遍历失败"""
+        if folder_path == self.file_path_input.text():
+            self.current_file_info.setPlainText(f"获取文件列表失败：{message}")
+
+    def _on_folder_scanned(self, folder_path, file_list, total_size):
+        """待上传文件夹遍历完成"""
+        # 用户已选择了其他路径时忽略过期的结果
+        if folder_path != self.file_path_input.text():
+            return
+        self.folder_scan_result = (folder_path, file_list)
 
-        except Exception as e:
-            self.current_file_info.setText(f"获取文列表失败：{str(e)}")
+        # 格式化显示信息，一次性拼接
+        lines = [
+            f"文件夹路径：{folder_path}",
+            f"总文件数：{len(file_list)} 个",
+            f"总大小：{total_size / 1024 / 1024:.2f} MB",
+            "",
+            "待上传文件列表：",
+            "-" * 50,
+        ]
 
-    def _upload_single_file(self, file_path):
-        """上传单文件，支持分片上传"""
-        try:
-            file_size = os.path.getsize(file_path)
-            file_info = f"文件路径：{file_path}\n"
-            file_info += f"文件大小：{file_size / 1024 / 1024:.2f} MB\n"
-            file_info += f"文件类型：{os.path.splitext(file_path)[1]}"
-            self.current_file_info.setText(file_info)
+        # 文件列表已按照文件大小降序排序，只显示前面一部分
+        for relative_path, size in file_list[:PENDING_FILES_DISPLAY_LIMIT]:
+            lines.append(f"📄 {relative_path}")
+            lines.append(f"   大小：{size / 1024 / 1024:.2f} MB")
 
-            custom_name = self.custom_name_input.text()
-            r2_key = custom_name if custom_name else os.path.basename(file_path)
+        hidden_count = len(file_list) - PENDING_FILES_DISPLAY_LIMIT
+        if hidden_count > 0:
+            lines.append(f"... 还有 {hidden_count} 个较小的文件未显示")
 
-            # 显示开始上传的消息
-            self.show_result(f'开始上传文件: {r2_key}', False)
+        self.current_file_info.setPlainText("\n".join(lines))
 
-            # 设置分片大小为20MB
-            chunk_size = 20 * 1024 * 1024  # 20MB in bytes
-            
-            # 如果文件大小超过50MB，使用分片上传
-            if file_size > 50 * 1024 * 1024:  # 50MB
-                try:
-                    # 初始化分片上传
-                    mpu = self.s3_client.create_multipart_upload(
-                        Bucket=self.bucket_name,
-                        Key=r2_key
-                    )
-                    
-                    # 计算分片数量
-                    total_parts = (file_size + chunk_size - 1) // chunk_size
-                    parts = []
-                    total_uploaded = 0
-                    
-                    with open(file_path, 'rb') as f:
-                        for part_number in range(1, total_parts + 1):
-                            # 读取分片数据
-                            data = f.read(chunk_size)
-                            data_len = len(data)
-                            total_uploaded += data_len
-                            
-                            # 创建进度回调
-                            self.upload_worker = UploadWorker(self)
-                            self.upload_worker.progress_updated.connect(self.progress_bar.setValue)
-                            self.upload_worker.status_updated.connect(self.show_result)
-                            self.upload_worker.set_file_info(
-                                file_path, 
-                                file_size,  # 使用总文件大小而不是分片大小
-                                part_number, 
-                                total_parts
-                            )
-                            
-                            # 更新总体进度
-                            percentage = (total_uploaded / file_size) * 100
-                            self.progress_bar.setValue(int(percentage))
-                            self.show_result(
-                                f'正在上传: {os.path.basename(file_path)} - {percentage:.1f}% (分片 {part_number}/{total_parts})', 
-                                False
-                            )
-                            
-                            # 上传分片
-                            response = self.s3_client.upload_part(
-                                Bucket=self.bucket_name,
-                                Key=r2_key,
-                                PartNumber=part_number,
-                                UploadId=mpu['UploadId'],
-                                Body=data
-                            )
-                            
-                            # 记录分片信息
-                            parts.append({
-                                'PartNumber': part_number,
-                                'ETag': response['ETag']
-                            })
-                            
-                            self.show_result(f'分片 {part_number}/{total_parts} 上传完成', False)
-                    
-                    # 完成分片上传
-                    self.s3_client.complete_multipart_upload(
-                        Bucket=self.bucket_name,
-                        Key=r2_key,
-                        UploadId=mpu['UploadId'],
-                        MultipartUpload={'Parts': parts}
-                    )
-                    
-                except Exception as e:
-                    # 如果上传失败，中止分片上传
-                    self.s3_client.abort_multipart_upload(
-                        Bucket=self.bucket_name,
-                        Key=r2_key,
-                        UploadId=mpu['UploadId']
-                    )
-                    raise e
-                
+    def _upload_single_file(self, file_path):
+        """在后台线程中上传单文件，大文件自动分片上传"""
+        file_size = os.path.getsize(file_path)
+        file_info = f"文件路径：{file_path}\n"
+        file_info += f"文件大小：{file_size / 1024 / 1024:.2f} MB\n"
+        file_info += f"文件类型：{os.path.splitext(file_path)[1]}"
+        self.current_file_info.setText(file_info)
+
+        # 如果有自定义文件名，使用自定义的
+        custom_name = self.custom_name_input.text().strip()
+        r2_key = custom_name if custom_name else os.path.basename(file_path)
+
+        # 显示开始上传的消息
+        self.show_result(f'开始上传文件: {r2_key}', False)
+        # 输入框会在上传开始后清空，先记下所在目录供完成时显示
+        self.current_upload_folder = os.path.dirname(file_path)
+
+        # 创建并启动上传线程，完成后通过信号通知界面
+        self.upload_thread = UploadThread(
+            self.s3_client,
+            self.bucket_name,
+            file_path,
+            r2_key,
+            self,
+            check_replaced=True
+        )
+        self.upload_thread.progress_updated.connect(self.progress_bar.setValue)
+        self.upload_thread.status_updated.connect(self.show_result)
+        self.upload_thread.speed_updated.connect(
+            lambda speed: self.update_upload_info(
+                os.path.dirname(file_path),
+                1,
+                0,
+                r2_key,
+                file_size,
+                speed
+            )
+        )
+        self.upload_thread.upload_finished.connect(self._on_single_upload_finished)
+        self.upload_thread.finished.connect(self._on_single_thread_finished)
+        self.upload_thread.start()
+
+    def _on_single_upload_finished(self, success, message):
+        """单文件上传线程结束"""
+        self._handle_upload_finished(success, message, 0, 1)
+        # 上传成功后按新增的字节数更新桶大小（覆盖同名对象时减去原大小）
+        if success:
+            upload_thread = self.upload_thread
+            if upload_thread.replaced_size is None:
+                self._adjust_bucket_size(None)
             else:
-                # 小文件使用普通上传
-                self.upload_worker = UploadWorker(self)
-                self.upload_worker.progress_updated.connect(self.progress_bar.setValue)
-                self.upload_worker.status_updated.connect(self.show_result)
-                self.upload_worker.set_file_info(file_path, file_size)
+                self._adjust_bucket_size(upload_thread.total_size - upload_thread.replaced_size)
+        self.refresh_file_list(self.current_path)
 
-                self.s3_client.upload_file(
-                    file_path, 
-                    self.bucket_name, 
-                    r2_key,
-                    Callback=self.upload_worker
-                )
+    def _on_single_thread_finished(self):
+        """单文件上传线程真正结束后再释放"""
+        upload_thread, self.upload_thread = self.upload_thread, None
+        upload_thread.deleteLater()
 
-            self.progress_bar.setValue(100)
-            self.show_result(f'文件 {r2_key} 上传成功！', False)
+    def _upload_folder(self, folder_path):
+        """上传文件夹 - 并发版本（多个上传线程由信号依次接力，不阻塞界面）"""
+        self.current_upload_folder = folder_path
 
-        except Exception as e:
-            self.show_result(f'上传失败：{str(e)}', True)
-        finally:
-            self.progress_bar.setValue(0)
-            self.file_path_input.clear()
-            self.custom_name_input.clear()
+        # 选择文件夹时已在后台遍历过，直接复用其结果；否则先在后台遍历，完成后再开始上传
+        scan_result, self.folder_scan_result = self.folder_scan_result, None
+        if scan_result is not None and scan_result[0] == folder_path:
+            self._start_folder_upload(folder_path, scan_result[1])
+            return
 
-    def _upload_folder(self, folder_path):
-        """上传文件夹 - 并发版本"""
+        self.show_result(f'正在统计待上传文件: {folder_path}', False)
+        scan_thread = FolderScanThread(folder_path, self)
+        scan_thread.scan_finished.connect(
+            lambda folder_path, file_list, total_size, scan_thread=scan_thread:
+                self._on_upload_folder_scanned(scan_thread, folder_path, file_list)
+        )
+        scan_thread.scan_failed.connect(
+            lambda folder_path, message: self.show_result(f'文件夹上传失败：{message}', True)
+        )
+        scan_thread.finished.connect(
+            lambda scan_thread=scan_thread: self._on_upload_folder_scan_thread_finished(scan_thread)
+        )
+        self.folder_upload_scan_thread = scan_thread
+        scan_thread.start()
+
+    def _on_upload_folder_scanned(self, scan_thread, folder_path, file_list):
+        """上传前的文件夹遍历完成（窗口关闭时已取消的遍历结果直接忽略）"""
+        if scan_thread is self.folder_upload_scan_thread:
+            self._start_folder_upload(folder_path, file_list)
+
+    def _on_upload_folder_scan_thread_finished(self, scan_thread):
+        """上传前的文件夹遍历线程真正结束后再释放"""
+        if scan_thread is self.folder_upload_scan_thread:
+            self.folder_upload_scan_thread = None
+        scan_thread.deleteLater()
+
+    def _start_folder_upload(self, folder_path, file_list):
+        """按遍历得到的文件列表 [(相对路径, 大小), ...] 开始并发上传文件夹"""
         try:
-            self.current_upload_folder = folder_path
             base_folder_name = os.path.basename(folder_path)
-            all_files = self._get_folder_files(folder_path)
+
+            # 待上传队列（文件列表已按大小降序排列，大文件先开始上传）；
+            # 每个上传线程结束后从队列中取出下一个文件
+            pending_files = deque(
+                (os.path.join(folder_path, relative_path), relative_path,
+                 os.path.join(base_folder_name, relative_path).replace('\\', '/'))
+                for relative_path, _ in file_list
+            )
             
-            total_files = len(all_files)
+            total_files = len(pending_files)
             if total_files == 0:
                 self.show_result('文件夹为空，没有上传的文件', True)
                 return
@@ -929,157 +1244,141 @@ class R2UploaderGUI(QMainWindow):
             max_workers = self.thread_count_input.value()  # QSpinBox 直接返回 int
 
             self.show_result(f'开始并发上传文件夹: {folder_path} (并发数: {max_workers})', False)
-            uploaded_files = 0
-            failed_files = []
-
-            self.update_upload_info(self.current_upload_folder, total_files, uploaded_files)
+            self.folder_total_files = total_files
+            self.update_upload_info(self.current_upload_folder, total_files, 0)
             self.progress_bar.setValue(0)  # 重置进度条
 
-            # 使用线程池并发上传
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # 提交所有上传任务
-                future_to_file = {}
-                for local_path, relative_path in all_files:
-                    r2_key = os.path.join(base_folder_name, relative_path).replace('\\', '/')
-                    future = executor.submit(self._upload_single_file_sync, local_path, r2_key)
-                    future_to_file[future] = (local_path, relative_path)
-
-                # 处理完成的任务
-                for future in as_completed(future_to_file):
-                    local_path, relative_path = future_to_file[future]
-                    current_file = os.path.basename(local_path)
-                    
-                    try:
-                        success, message = future.result()
-                        if success:
-                            uploaded_files += 1
-                            self.show_result(f'✅ 文件上传成功: {current_file}', False)
-                        else:
-                            self.show_result(f'❌ {message}', True)
-                            failed_files.append((relative_path, message))
-                    except Exception as e:
-                        error_msg = f'文件上传失败：{current_file} - {str(e)}'
-                        self.show_result(f'❌ {error_msg}', True)
-                        failed_files.append((relative_path, str(e)))
-                    
-                    # 更新进度（已完成的文件数 / 总文件数）
-                    completed = uploaded_files + len(failed_files)
-                    progress = int(completed / total_files * 100)
-                    self.progress_bar.setValue(progress)
-                    self.update_upload_info(self.current_upload_folder, total_files, uploaded_files)
-                    QApplication.processEvents()
+            self.folder_pending_files = pending_files
+            # 多个文件同时分片上传时共享同一个连接池，按并发文件数分摊连接
+            self.folder_max_concurrency = max(1, MAX_POOL_CONNECTIONS // max_workers)
+            self.folder_uploaded_files = 0
+            self.folder_failed_files = []
 
-            # 显示最终上传结果
-            self._show_final_results(uploaded_files, total_files, failed_files)
+            for _ in range(min(max_workers, total_files)):
+                if not self.folder_pending_files:
+                    break
+                self._start_next_folder_upload()
 
         except Exception as e:
             self.show_result(f'文件夹上传失败：{str(e)}', True)
-        finally:
             self.progress_bar.setValue(0)
 
-    def _upload_single_file_sync(self, local_path, r2_key):
-        """同步上传单个文件（用于线程池）- 使用独立客户端"""
-        try:
-            file_size = os.path.getsize(local_path)
-            current_file = os.path.basename(local_path)
-            
-            # 为线程创建独立的 S3 客户端（线程安全）
-            thread_s3_client = boto3.client(
-                service_name='s3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key_id,
-                aws_secret_access_key=self.access_key_secret,
-                config=Config(
-                    signature_version='s3v4',
-                    retries={'max_attempts': 3},
-                    connect_timeout=30,
-                    read_timeout=60
-                ),
-                region_name='auto',
-                verify=False
-            )
-            
-            # 小文件直接上传
-            if file_size < 50 * 1024 * 1024:  # 小于50MB
-                thread_s3_client.upload_file(
-                    local_path,
+    def _start_next_folder_upload(self):
+        """从待上传队列中取出下一个文件并启动上传线程"""
+        while self.folder_pending_files:
+            local_path, relative_path, r2_key = self.folder_pending_files.popleft()
+            try:
+                upload_thread = UploadThread(
+                    self.s3_client,
                     self.bucket_name,
-                    r2_key
-                )
-            else:
-                # 大文件分片上传
-                chunk_size = 20 * 1024 * 1024
-                mpu = thread_s3_client.create_multipart_upload(
-                    Bucket=self.bucket_name,
-                    Key=r2_key
-                )
-                
-                parts = []
-                with open(local_path, 'rb') as f:
-                    part_number = 1
-                    while True:
-                        data = f.read(chunk_size)
-                        if not data:
-                            break
-                        
-                        response = thread_s3_client.upload_part(
-                            Bucket=self.bucket_name,
-                            Key=r2_key,
-                            PartNumber=part_number,
-                            UploadId=mpu['UploadId'],
-                            Body=data
-                        )
-                        
-                        parts.append({
-                            'PartNumber': part_number,
-                            'ETag': response['ETag']
-                        })
-                        part_number += 1
-                
-                thread_s3_client.complete_multipart_upload(
-                    Bucket=self.bucket_name,
-                    Key=r2_key,
-                    UploadId=mpu['UploadId'],
-                    MultipartUpload={'Parts': parts}
+                    local_path,
+                    r2_key,
+                    self,
+                    max_concurrency=self.folder_max_concurrency
                 )
-            
-            return True, f'文件上传成功: {current_file}'
-            
-        except Exception as e:
-            return False, f'文件上传失败：{os.path.basename(local_path)} - {str(e)}'
+            except Exception as e:
+                # 文件无法读取时直接记为失败，继续下一个
+                self._on_folder_file_finished(False, f'上传失败：{str(e)}', local_path, relative_path)
+                continue
+
+            upload_thread.upload_finished.connect(
+                lambda success, message, local_path=local_path, relative_path=relative_path:
+                    self._on_folder_file_finished(success, message, local_path, relative_path)
+            )
+            # 线程真正结束后才启动下一个，保证并发数不超过设置值
+            upload_thread.finished.connect(
+                lambda upload_thread=upload_thread: self._on_folder_thread_finished(upload_thread)
+            )
+            self.folder_upload_threads.add(upload_thread)
+            upload_thread.start()
+            return
+
+        if not self.folder_upload_threads:
+            self._on_folder_upload_finished()
+
+    def _on_folder_thread_finished(self, upload_thread):
+        """文件夹中的某个上传线程结束"""
+        self.folder_upload_threads.discard(upload_thread)
+        upload_thread.deleteLater()
+        self._start_next_folder_upload()
+
+    def _on_folder_file_finished(self, success, message, local_path, relative_path):
+        """文件夹中单个文件上传结束"""
+        current_file = os.path.basename(local_path)
+        if success:
+            self.folder_uploaded_files += 1
+            self.show_result(f'✅ 文件上传成功: {current_file}', False)
+        else:
+            self.folder_failed_files.append((relative_path, message))
+            self.show_result(f'❌ {current_file} - {message}', True)
+
+        # 更新进度（已完成的文件数 / 总文件数）
+        completed = self.folder_uploaded_files + len(self.folder_failed_files)
+        progress = int(completed / self.folder_total_files * 100)
+        self.progress_bar.setValue(progress)
+        self.update_upload_info(self.current_upload_folder, self.folder_total_files, self.folder_uploaded_files)
+
+    def _on_folder_upload_finished(self):
+        """文件夹上传结束"""
+        # 显示最终上传结果
+        self._show_final_results(self.folder_uploaded_files, self.folder_total_files, self.folder_failed_files)
+        self.progress_bar.setValue(0)
+        # 上传完成后刷新文件列表并重新计算桶大小
+        self.refresh_file_list(self.current_path, calculate_bucket_size=True)
 
     def calculate_bucket_size(self):
-        """计算整个桶的总大小"""
-        try:
-            # 更新标签显示正在统计
-            self.bucket_size_label.setText('桶大小: 统计中...')
-            QApplication.processEvents()  # 确保UI更新
-            
-            total_size = 0
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            
-            # 遍历所有对象，不使用 prefix
-            for page in paginator.paginate(Bucket=self.bucket_name):
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        if not obj['Key'].endswith('/'):  # 排除目录
-                            total_size += obj['Size']
-            
-            # 更新显示
-            formatted_size = self._format_size(total_size)
-            self.bucket_size_label.setText(f'桶大小: {formatted_size}')
-            
-        except Exception as e:
-            print(f"计算桶大小时发生错误: {str(e)}")
-            self.bucket_size_label.setText('桶大小: 计算失败')
+        """在后台线程中计算整个桶的总大小"""
+        # 上一次统计尚未结束时，等其结束后再重新统计
+        if self.bucket_size_thread is not None and self.bucket_size_thread.isRunning():
+            self.bucket_size_pending = True
+            return
+        self.bucket_size_pending = False
+
+        # 更新标签显示正在统计
+        self._bucket_size_bytes = None
+        self.bucket_size_label.setText('桶大小: 统计中...')
+
+        self.bucket_size_thread = QThread()
+        self.bucket_size_worker = Worker(self.s3_client, self.bucket_name)
+        self.bucket_size_worker.moveToThread(self.bucket_size_thread)
+
+        self.bucket_size_thread.started.connect(self.bucket_size_worker.calculate_bucket_size)
+        self.bucket_size_worker.size_updated.connect(
+            lambda size: self.bucket_size_label.setText(f'桶大小: {self._format_size(size)} (统计中...)')
+        )
+        self.bucket_size_worker.size_calculated.connect(self._on_bucket_size_calculated)
+        self.bucket_size_worker.failed.connect(
+            lambda message: self.bucket_size_label.setText('桶大小: 计算失败')
+        )
+        self.bucket_size_worker.finished.connect(self.bucket_size_thread.quit)
+        self.bucket_size_thread.finished.connect(self._on_bucket_size_thread_finished)
+        self.bucket_size_thread.start()
+
+    def _on_bucket_size_calculated(self, size):
+        """桶大小统计完成"""
+        self._bucket_size_bytes = size
+        self._update_bucket_label()
+
+    def _update_bucket_label(self):
+        """显示当前记录的桶大小"""
+        self.bucket_size_label.setText(f'桶大小: {self._format_size(self._bucket_size_bytes)}')
+
+    def _adjust_bucket_size(self, delta):
+        """按上传、删除的字节数增量更新桶大小；增量未知或尚未统计完成时重新统计"""
+        if delta is None or self._bucket_size_bytes is None:
+            self.calculate_bucket_size()
+            return
+        self._bucket_size_bytes = max(self._bucket_size_bytes + delta, 0)
+        self._update_bucket_label()
+
+    def _on_bucket_size_thread_finished(self):
+        """桶大小统计线程结束，如有新的统计请求则重新开始"""
+        if self.bucket_size_pending:
+            self.calculate_bucket_size()
 
     def refresh_file_list(self, prefix='', calculate_bucket_size=False):
         """刷新文件列表"""
         try:
-            # 清空当前显示
-            self.file_list.clear()
-            self.icon_list.clear()
-            
             # 仅在需要时计算桶大小
             if calculate_bucket_size:
                 self.calculate_bucket_size()
@@ -1088,7 +1387,9 @@ class R2UploaderGUI(QMainWindow):
             response = self.s3_client.list_objects_v2(
                 Bucket=self.bucket_name, 
                 Prefix=prefix, 
-                Delimiter='/'
+                Delimiter='/',
+                FetchOwner=False,
+                MaxKeys=LIST_PAGE_SIZE
             )
             
             # 更新当前路径显示
@@ -1096,77 +1397,57 @@ class R2UploaderGUI(QMainWindow):
             self.current_path = prefix
             self.back_button.setEnabled(bool(prefix))
             
-            # 存储文件和目录项，以便排序
-            files = []
-            directories = []
+            # 过滤掉目录占位对象，文件按最后修改时间降序排列（最新的在前面）
+            files = [
+                obj for obj in response.get('Contents', ())
+                if obj['Key'] != prefix and not obj['Key'].endswith('/')
+            ]
+            files.sort(key=lambda obj: obj['LastModified'], reverse=True)
+            directories = response.get('CommonPrefixes', ())
             
-            # 处理文件
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    if obj['Key'] == prefix or obj['Key'].endswith('/'):
-                        continue
-                    
-                    file_name = obj['Key'].split('/')[-1]
-                    files.append({
-                        'name': file_name,
-                        'key': obj['Key'],
-                        'size': obj['Size'],
-                        'last_modified': obj['LastModified']
-                    })
-            
-            # 处理目录
-            if 'CommonPrefixes' in response:
-                for prefix_obj in response['CommonPrefixes']:
-                    dir_name = prefix_obj['Prefix'].rstrip('/').split('/')[-1] + '/'
-                    directories.append({
-                        'name': dir_name,
-                        'prefix': prefix_obj['Prefix']
-                    })
-            
-            # 按最后修改时间降序排文件（最新的在前面）
-            files.sort(key=lambda x: x['last_modified'], reverse=True)
-            
-            # 先添加文件
-            for file in files:
-                # 列表视图项
-                tree_item = QTreeWidgetItem(self.file_list)
-                tree_item.setText(0, file['name'])
-                tree_item.setText(1, self._get_file_type(file['name']))
-                tree_item.setText(2, self._format_size(file['size']))
-                tree_item.setText(3, file['last_modified'].strftime('%Y-%m-%d %H:%M:%S'))
-                tree_item.setIcon(0, self._get_file_icon(file['name']))
-                tree_item.setData(0, Qt.ItemDataRole.UserRole, file['key'])
-                
-                # 标图项
-                icon_item = QListWidgetItem(self.icon_list)
-                icon_item.setText(file['name'])
-                icon_item.setIcon(self._get_file_icon(file['name']))
-                icon_item.setData(Qt.ItemDataRole.UserRole, file['key'])
-                icon_item.setData(Qt.ItemDataRole.UserRole + 1, 'file')
-            
-            # 再添加目录
-            for directory in directories:
-                # 列表视图项
-                tree_item = QTreeWidgetItem(self.file_list)
-                tree_item.setText(0, directory['name'])
-                tree_item.setText(1, '目录')
-                tree_item.setIcon(0, self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon))
-                tree_item.setData(0, Qt.ItemDataRole.UserRole, directory['prefix'])
-                
-                # 图标视图项
-                icon_item = QListWidgetItem(self.icon_list)
-                icon_item.setText(directory['name'])
-                icon_item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon))
-                icon_item.setData(Qt.ItemDataRole.UserRole, directory['prefix'])
-                icon_item.setData(Qt.ItemDataRole.UserRole + 1, 'directory')
+            # 先文件后目录，构建好全部行后一次性替换模型数据（每次刷新只重置一次模型）
+            rows = list(map(self._row_for_file, files))
+            rows.extend(
+                self._create_directory_row(prefix_obj['Prefix'], prefix)
+                for prefix_obj in directories
+            )
+            self.file_model.set_rows(rows)
 
         except Exception as e:
+            # 获取失败时清空当前显示
+            self.file_model.clear()
             QMessageBox.warning(self, '错误', f'获取文件列表失败：{str(e)}')
 
-    def on_item_double_clicked(self, item):
+    def _row_for_file(self, obj):
+        """根据 list_objects_v2 返回的对象创建文件列表模型的一行，文件名和扩展名只解析一次"""
+        key = obj['Key']
+        file_name = key.rpartition('/')[2]
+        ext = os.path.splitext(file_name)[1].lower()
+
+        # 类型、文件类型和图标只由扩展名决定，统一由 _file_row_templates 按扩展名缓存
+        template = self._file_row_templates.get(ext)
+        if template is None:
+            icon = self._icon_cache[FILE_ICON_MAP.get(ext, QStyle.StandardPixmap.SP_FileIcon)]
+            template = ('file', self._ext_to_type(ext), icon)
+            self._file_row_templates[ext] = template
+
+        size = obj['Size']
+        return (
+            (key, file_name)
+            + template
+            + (self._format_size(size), obj['LastModified'].strftime(LAST_MODIFIED_FORMAT), size)
+        )
+
+    def _create_directory_row(self, dir_prefix, parent_prefix):
+        """创建目录在文件列表模型中的一行"""
+        # CommonPrefixes 均以当前前缀开头、以 / 结尾，截掉当前前缀即为目录名
+        dir_name = dir_prefix[len(parent_prefix):]
+        return (dir_prefix, dir_name) + self._dir_row_template
+
+    def on_item_double_clicked(self, index):
         """处理双击事件"""
-        path = item.data(0, Qt.ItemDataRole.UserRole)
-        if item.text(1) == '目录':
+        path = index.data(Qt.ItemDataRole.UserRole)
+        if index.data(R2ListModel.KIND_ROLE) == 'directory':
             self.refresh_file_list(path, calculate_bucket_size=False)  # 不重新计算桶大小
 
     def go_back(self):
@@ -1178,52 +1459,32 @@ class R2UploaderGUI(QMainWindow):
                 parent_path += '/'
             self.refresh_file_list(parent_path, calculate_bucket_size=False)  # 不重新计算桶大小
 
-    def _get_file_type(self, filename):
-        """获取文件型"""
-        ext = os.path.splitext(filename)[1].lower()
-        if not ext:
-            return '--'
-        return ext[1:].upper()  # 移除点号并转为大写
+    @staticmethod
+    def _ext_to_type(ext):
+        """扩展名对应的文件类型（结果由 _file_row_templates 按扩展名缓存）"""
+        return ext[1:].upper() if ext else '--'  # 移除点号并转为大写
 
     def _format_size(self, size_in_bytes):
         """格式化文件大小"""
-        try:
-            # 定义单位和转换基数
-            units = ['B', 'KB', 'MB', 'GB', 'TB']
-            base = 1024
-            
-            # 如果小于1024字节，直接返回字节大小
-            if size_in_bytes < base:
-                return f"{size_in_bytes:.2f} B"
-            
-            # 计算合适的单位级别
-            exp = int(math.log(size_in_bytes, base))
-            if exp >= len(units):
-                exp = len(units) - 1
-                
-            # 计算最终大小
-            final_size = size_in_bytes / (base ** exp)
-            return f"{final_size:.2f} {units[exp]}"
-            
-        except Exception as e:
-            return "计算错误"
+        # 如果小于1024字节，直接返回字节大小
+        if size_in_bytes < 1024:
+            return f"{size_in_bytes:.2f} B"
+
+        # 每个单位相差 2^10，由二进制位数直接得到单位级别
+        exp = min((int(size_in_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{size_in_bytes / (1 << (exp * 10)):.2f} {SIZE_UNITS[exp]}"
 
     def show_result(self, message, is_error=False):
         """示执行结果（倒序显示，最新的在上面）"""
         timestamp = QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')
         formatted_message = f"[{timestamp}] {'❌ ' if is_error else '✅ '}{message}"
         
-        # 获取当前的文本内
-        current_text = self.result_info.toPlainText()
-        
-        # 将新消息添加到最前面
-        if current_text:
-            new_text = formatted_message + '\n' + current_text
-        else:
-            new_text = formatted_message
-        
-        # 更新文本显示
-        self.result_info.setText(new_text)
+        # 用光标在文档开头插入新消息，无需读取并重新设置全部历史文本
+        if not self.result_info.document().isEmpty():
+            formatted_message += '\n'
+        cursor = QTextCursor(self.result_info.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.insertText(formatted_message)
         
         # 将滚动条移动到顶部
         self.result_info.verticalScrollBar().setValue(0)
@@ -1260,19 +1521,20 @@ class R2UploaderGUI(QMainWindow):
 
     def show_context_menu(self, position):
         """显示右键菜单"""
-        item = self.file_list.itemAt(position)
-        if item is None:
+        # 统一使用名称列的索引，便于取得条目名称
+        item = self.file_list.indexAt(position).siblingAtColumn(0)
+        if not item.isValid():
             return
 
         menu = QMenu()
         
-        if item.text(1) == '目录':
+        if item.data(R2ListModel.KIND_ROLE) == 'directory':
             # 目录操作菜单
             enter_dir = menu.addAction("进入目录 (Enter)")
             enter_dir.triggered.connect(lambda: self.on_item_double_clicked(item))
             
             delete_dir = menu.addAction("删除目录 (Ctrl+L)")
-            delete_dir.triggered.connect(lambda: self.delete_directory(item.data(0, Qt.ItemDataRole.UserRole)))
+            delete_dir.triggered.connect(lambda: self.delete_directory(item.data(Qt.ItemDataRole.UserRole)))
         else:
             # 文件操作菜单
             delete_action = menu.addAction("删除文件 (Ctrl+D)")
@@ -1282,21 +1544,24 @@ class R2UploaderGUI(QMainWindow):
             r2_domain = menu.addAction("通过 R2.dev 分享 (Ctrl+E)")
             
             custom_domain.triggered.connect(
-                lambda: self.generate_public_share(item, use_custom_domain=True)
+                lambda: self._share(item.data(Qt.ItemDataRole.UserRole), use_custom_domain=True)
             )
             r2_domain.triggered.connect(
-                lambda: self.generate_public_share(item, use_custom_domain=False)
+                lambda: self._share(item.data(Qt.ItemDataRole.UserRole), use_custom_domain=False)
             )
 
         menu.exec(self.file_list.viewport().mapToGlobal(position))
 
     def delete_file(self, item):
-        """删除文件"""
-        object_key = item.data(0, Qt.ItemDataRole.UserRole)
+        """删除文件（列表视图和图标视图共用）"""
+        self._delete_one(item.data(Qt.ItemDataRole.UserRole), item.data(), item.data(R2ListModel.SIZE_ROLE))
+
+    def _delete_one(self, object_key, display_name, file_size):
+        """确认后删除单个文件"""
         reply = QMessageBox.question(
             self, 
             '确认删除', 
-            f'确定要删除文件 {item.text(0)} 吗？',
+            f'确定要删除文件 {display_name} 吗？',
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
@@ -1306,24 +1571,22 @@ class R2UploaderGUI(QMainWindow):
                     Bucket=self.bucket_name,
                     Key=object_key
                 )
-                self.show_result(f'文件 {item.text(0)} 已删除', False)
-                # 刷新文件列表并更新桶大小
-                self.refresh_file_list(self.current_path, calculate_bucket_size=True)
+                self.show_result(f'文件 {display_name} 已删除', False)
+                # 按删除的字节数更新桶大小并刷新文件列表
+                self._adjust_bucket_size(-file_size)
+                self.refresh_file_list(self.current_path)
             except Exception as e:
                 self.show_result(f'删除文件失败：{str(e)}', True)
 
-    def generate_public_share(self, item, use_custom_domain=True):
-        """生成永久分享链接"""
-        object_key = item.data(0, Qt.ItemDataRole.UserRole)
-        
+    def _share(self, object_key, use_custom_domain=True):
+        """生成永久分享链接并复制到剪贴板"""
         if use_custom_domain:
-            domain = os.getenv('R2_CUSTOM_DOMAIN')
+            domain = self.custom_domain
             domain_type = "自定义域名"
-            url = f"https://{domain}/{object_key}"
         else:
-            domain = os.getenv('R2_PUBLIC_DOMAIN')
+            domain = self.public_domain
             domain_type = "R2.dev"
-            url = f"https://{domain}/{object_key}"
+        url = f"https://{domain}/{object_key}"
         
         # 复制到剪贴板
         clipboard = QApplication.clipboard()
@@ -1341,18 +1604,18 @@ class R2UploaderGUI(QMainWindow):
     def on_icon_double_clicked(self, item):
         """处理图标视图的双击事件"""
         path = item.data(Qt.ItemDataRole.UserRole)
-        if item.data(Qt.ItemDataRole.UserRole + 1) == 'directory':
+        if item.data(R2ListModel.KIND_ROLE) == 'directory':
             self.refresh_file_list(path)
 
     def show_icon_context_menu(self, position):
         """显示图标视图的右键菜单"""
-        item = self.icon_list.itemAt(position)
-        if item is None:
+        item = self.icon_list.indexAt(position)
+        if not item.isValid():
             return
 
         menu = QMenu()
         
-        if item.data(Qt.ItemDataRole.UserRole + 1) == 'directory':
+        if item.data(R2ListModel.KIND_ROLE) == 'directory':
             # 目录操作菜单
             enter_dir = menu.addAction("进入目录 (Enter)")
             enter_dir.triggered.connect(lambda: self.on_icon_double_clicked(item))
@@ -1364,122 +1627,37 @@ class R2UploaderGUI(QMainWindow):
         else:
             # 文件操作菜单
             delete_action = menu.addAction("删除文件 (Ctrl+D)")
-            delete_action.triggered.connect(lambda: self.delete_icon_file(item))
+            delete_action.triggered.connect(lambda: self.delete_file(item))
             
             custom_domain = menu.addAction("通过自定义域名分享 (Ctrl+Z)")
             r2_domain = menu.addAction("通过 R2.dev 分享 (Ctrl+E)")
             
             custom_domain.triggered.connect(
-                lambda: self.generate_public_share_icon(item, use_custom_domain=True)
+                lambda: self._share(item.data(Qt.ItemDataRole.UserRole), use_custom_domain=True)
             )
             r2_domain.triggered.connect(
-                lambda: self.generate_public_share_icon(item, use_custom_domain=False)
+                lambda: self._share(item.data(Qt.ItemDataRole.UserRole), use_custom_domain=False)
             )
 
         menu.exec(self.icon_list.viewport().mapToGlobal(position))
 
-    def delete_icon_file(self, item):
-        """删除图标视图中的文件"""
-        object_key = item.data(Qt.ItemDataRole.UserRole)
-        reply = QMessageBox.question(
-            self, 
-            '确认删除', 
-            f'确定要删除文件 {item.text()} 吗？',
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            try:
-                self.s3_client.delete_object(
-                    Bucket=self.bucket_name,
-                    Key=object_key
-                )
-                self.show_result(f'文件 {item.text()} 已删除', False)
-                # 刷新文件列表并更新桶大小
-                self.refresh_file_list(self.current_path, calculate_bucket_size=True)
-            except Exception as e:
-                self.show_result(f'删除文件失败：{str(e)}', True)
-
-    def generate_public_share_icon(self, item, use_custom_domain=True):
-        """为图标视图生成永久分享链接"""
-        object_key = item.data(Qt.ItemDataRole.UserRole)
-        
-        if use_custom_domain:
-            domain = os.getenv('R2_CUSTOM_DOMAIN')
-            domain_type = "自定义域名"
-            url = f"https://{domain}/{object_key}"
-        else:
-            domain = os.getenv('R2_PUBLIC_DOMAIN')
-            domain_type = "R2.dev"
-            url = f"https://{domain}/{object_key}"
-        
-        # 复制到剪贴板
-        clipboard = QApplication.clipboard()
-        clipboard.setText(url)
-        self.show_result(f"复制{domain_type}访问链接到剪贴板: {url}", False)
+    def _current_selection(self):
+        """返回当前视图中选中的条目 (名称列索引, 条目类型, 对象键)，未选中时类型和键均为 None"""
+        view = self.file_list if self.stack_widget.currentIndex() == 0 else self.icon_list
+        item = view.currentIndex().siblingAtColumn(0)
+        return item, item.data(R2ListModel.KIND_ROLE), item.data(Qt.ItemDataRole.UserRole)
 
     def delete_selected_item(self):
         """处理删除快捷键"""
-        if self.stack_widget.currentIndex() == 0:  # 列表视图
-            item = self.file_list.currentItem()
-            if item and item.text(1) != '目录':
-                self.delete_file(item)
-        else:  # 图标视图
-            item = self.icon_list.currentItem()
-            if item and item.data(Qt.ItemDataRole.UserRole + 1) != 'directory':
-                self.delete_icon_file(item)
+        item, kind, _ = self._current_selection()
+        if kind == 'file':
+            self.delete_file(item)
 
     def share_selected_item(self, use_custom_domain):
         """处理分享快捷键"""
-        if self.stack_widget.currentIndex() == 0:  # 列表视图
-            item = self.file_list.currentItem()
-            if item and item.text(1) != '目录':
-                self.generate_public_share(item, use_custom_domain)
-        else:  # 图标视图
-            item = self.icon_list.currentItem()
-            if item and item.data(Qt.ItemDataRole.UserRole + 1) != 'directory':
-                self.generate_public_share_icon(item, use_custom_domain)
-
-    def _get_file_icon(self, filename):
-        """据文件类型回对应的图标"""
-        ext = os.path.splitext(filename)[1].lower()
-        
-        # 定义文件类型和对应标
-        icon_map = {
-            # 图片文件
-            '.jpg': QStyle.StandardPixmap.SP_FileDialogDetailedView,
-            '.jpeg': QStyle.StandardPixmap.SP_FileDialogDetailedView,
-            '.png': QStyle.StandardPixmap.SP_FileDialogDetailedView,
-            '.gif': QStyle.StandardPixmap.SP_FileDialogDetailedView,
-            '.bmp': QStyle.StandardPixmap.SP_FileDialogDetailedView,
-            
-            # 文档文件
-            '.pdf': QStyle.StandardPixmap.SP_FileDialogInfoView,
-            '.doc': QStyle.StandardPixmap.SP_FileDialogInfoView,
-            '.docx': QStyle.StandardPixmap.SP_FileDialogInfoView,
-            '.txt': QStyle.StandardPixmap.SP_FileDialogInfoView,
-            
-            # 压缩文件
-            '.zip': QStyle.StandardPixmap.SP_DriveFDIcon,
-            '.rar': QStyle.StandardPixmap.SP_DriveFDIcon,
-            '.7z': QStyle.StandardPixmap.SP_DriveFDIcon,
-            
-            # 音视频文件
-            '.mp3': QStyle.StandardPixmap.SP_MediaVolume,
-            '.wav': QStyle.StandardPixmap.SP_MediaVolume,
-            '.mp4': QStyle.StandardPixmap.SP_MediaPlay,
-            '.avi': QStyle.StandardPixmap.SP_MediaPlay,
-            '.mov': QStyle.StandardPixmap.SP_MediaPlay,
-            
-            # 代码文件
-            '.py': QStyle.StandardPixmap.SP_FileDialogContentsView,
-            '.js': QStyle.StandardPixmap.SP_FileDialogContentsView,
-            '.html': QStyle.StandardPixmap.SP_FileDialogContentsView,
-            '.css': QStyle.StandardPixmap.SP_FileDialogContentsView,
-        }
-        
-        # 返回对应的图标,如果没有匹配则返回默认文件标
-        return self.style().standardIcon(icon_map.get(ext, QStyle.StandardPixmap.SP_FileIcon))
+        _, kind, object_key = self._current_selection()
+        if kind == 'file':
+            self._share(object_key, use_custom_domain)
 
     def export_custom_urls(self):
         """导出所有文件的自定义域名URL和文件大小"""
@@ -1487,32 +1665,6 @@ class R2UploaderGUI(QMainWindow):
             # 显示开始信息
             self.show_result("开始导出文件URL列表...", False)
             
-            # 获取所有文件列表
-            all_files = []
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            
-            # 更新标签显示正在统计
-            self.show_result("正在遍历所有文件...", False)
-            QApplication.processEvents()
-            
-            # 遍历所有对象
-            for page in paginator.paginate(Bucket=self.bucket_name):
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        if not obj['Key'].endswith('/'):  # 排除目录
-                            all_files.append({
-                                'key': obj['Key'],
-                                'size': obj['Size']  # 添加文件大小
-                            })
-
-            # 计算总文件数
-            total_files = len(all_files)
-            if total_files == 0:
-                self.show_result("没有找到可导出的文件", False)
-                return
-
-            self.show_result(f"找到 {total_files} 文件，开始生成URL...", False)
-            
             # 获取当前时间并格式化
             current_time = QDateTime.currentDateTime().toString('yyyyMMdd_HHmmss')
             
@@ -1522,45 +1674,43 @@ class R2UploaderGUI(QMainWindow):
             
             self.show_result(f"备导出到文件: {csv_path}", False)
             
-            # 写入CSV文件，使用 utf-8-sig 编码（带BOM）
-            with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            total_files = 0
+            url_prefix = "https://r2.lss.lol/"
+            format_size = self._format_size
+            basename = os.path.basename
+
+            # 写入CSV文件，使用 utf-8-sig 编码（带BOM）；遍历到一页就写入一页，不在内存中保存完整列表
+            with open(csv_path, 'w', encoding='utf-8-sig', newline='', buffering=1 << 20) as f:
                 writer = csv.writer(f)
                 writer.writerow(['文件名', '文件路径', 'URL', '文件大小'])  # 添加文件大小列
                 
                 # 显示写入表头信息
-                self.show_result("已创建CSV文件并写入表头", False)
+                self.show_result("已创建CSV文件并写入表头，正在遍历所有文件...", False)
+                QApplication.processEvents()
                 
-                processed_count = 0
-                for i, file_info in enumerate(all_files, 1):
-                    # 生成自定义域名URL
-                    custom_url = f"https://r2.lss.lol/{file_info['key']}"
-                    
-                    # 获取文件名
-                    file_name = os.path.basename(file_info['key'])
-                    
-                    # 格式化文件大小
-                    formatted_size = self._format_size(file_info['size'])
-                    
-                    # 写入数据
-                    writer.writerow([
-                        file_name, 
-                        file_info['key'], 
-                        custom_url,
-                        formatted_size  # 添加格式化后的文件大小
-                    ])
+                for page in paginate_objects(self.s3_client, self.bucket_name):
+                    # 文件名、路径、自定义域名URL和格式化后的文件大小，整页一次写入
+                    rows = [
+                        (basename(key), key, url_prefix + key, format_size(obj['Size']))
+                        for obj in page.get('Contents', ())
+                        if not (key := obj['Key']).endswith('/')  # 排除目录
+                    ]
+                    writer.writerows(rows)
+                    total_files += len(rows)
                     
-                    processed_count = i
-                    
-                    # 每处理50个文件更新一次显示信息
-                    if i % 50 == 0 or i == total_files:
-                        self.show_result(f"已处理: {i}/{total_files} 个文件", False)
-                        QApplication.processEvents()
+                    # 每处理完一页更新一次显示信息
+                    self.show_result(f"已处理: {total_files} 个文件", False)
+                    QApplication.processEvents()
+
+            if total_files == 0:
+                os.remove(csv_path)
+                self.show_result("没有找到可导出的文件", False)
+                return
             
             # 显示完成信息
             final_message = (
                 f"导出完成！\n"
                 f"- 总文件数: {total_files}\n"
-                f"- 已处理: {processed_count}\n"
                 f"- 导出文件: {csv_path}"
             )
             self.show_result(final_message, False)
@@ -1609,62 +1759,17 @@ class R2UploaderGUI(QMainWindow):
         if not os.path.exists(file_path):
             self.show_result('选择的文件或文件夹不存在', True)
             return
+
+        if self._is_uploading():
+            self.show_result('已有上传任务正在进行，请稍候', True)
+            return
         
         try:
-            # 根据是文件还是文件夹选择不同的上传方
+            # 根据是文件还是文件夹选择不同的上传方式，上传均在后台线程中进行
             if os.path.isfile(file_path):
-                # 单个文件上传
-                file_size = os.path.getsize(file_path)
-                file_name = os.path.basename(file_path)
-                
-                # 如果有自定义文件名，使用自定义的
-                custom_name = self.custom_name_input.text().strip()
-                if custom_name:
-                    file_name = custom_name
-                
-                self.show_result(f'开始上传文件: {file_name}', False)
-                
-                # 创建并启动上传线程
-                upload_thread = UploadThread(
-                    self.s3_client,
-                    self.bucket_name,
-                    file_path,
-                    file_name
-                )
-                
-                # 连接信号
-                upload_thread.progress_updated.connect(self.progress_bar.setValue)
-                upload_thread.status_updated.connect(self.show_result)
-                upload_thread.speed_updated.connect(
-                    lambda speed: self.update_upload_info(
-                        os.path.dirname(file_path),
-                        1,
-                        0,
-                        file_name,
-                        file_size,
-                        speed
-                    )
-                )
-                upload_thread.upload_finished.connect(
-                    lambda success, msg: self._handle_upload_finished(
-                        success, msg, 0, 1
-                    )
-                )
-                
-                # 启动线程并等待完成
-                upload_thread.start()
-                while not upload_thread.isFinished():
-                    QApplication.processEvents()
-                    time.sleep(0.1)
-                
-                # 上传完成后刷新文件列表并重新计算桶大小
-                self.refresh_file_list(self.current_path, calculate_bucket_size=True)
-                
+                self._upload_single_file(file_path)
             else:
-                # 文件夹上传
                 self._upload_folder(file_path)
-                # 上传完成后刷新文件表并重新计算桶大小
-                self.refresh_file_list(self.current_path, calculate_bucket_size=True)
                 
         except Exception as e:
             self.show_result(f'上传失败：{str(e)}', True)
@@ -1673,20 +1778,11 @@ class R2UploaderGUI(QMainWindow):
             self.file_path_input.clear()
             self.custom_name_input.clear()
 
-    def _get_folder_files(self, folder_path):
-        """获取文件夹中的所有文件列表"""
-        all_files = []
-        try:
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    local_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(local_path, folder_path)
-                    all_files.append((local_path, relative_path))
-        except Exception as e:
-            self.show_result(f'获取文件列表失败：{str(e)}', True)
-            return []
-        
-        return all_files
+    def _is_uploading(self):
+        """是否有上传线程正在运行"""
+        if self.upload_thread is not None and self.upload_thread.isRunning():
+            return True
+        return bool(self.folder_upload_threads or self.folder_pending_files or self.folder_upload_scan_thread)
 
     def _handle_upload_finished(self, success, message, uploaded_files, total_files):
         """处理上传完成的回调"""
@@ -1697,7 +1793,7 @@ class R2UploaderGUI(QMainWindow):
             self.show_result(message, False)
             # 更新进度信息
             self.update_upload_info(
-                os.path.dirname(self.file_path_input.text().strip()),
+                self.current_upload_folder,
                 total_files,
                 uploaded_files
             )
@@ -1705,9 +1801,8 @@ class R2UploaderGUI(QMainWindow):
             # 显示错误信息
             self.show_result(message, True)
         
-        # 重置进度条
+        # 重置进度条（本方法由信号触发，界面会在返回事件循环后自然刷新）
         self.progress_bar.setValue(0)
-        QApplication.processEvents()
 
     def _show_final_results(self, uploaded_files, total_files, failed_files):
         """显示最终上传结果"""
@@ -1736,14 +1831,20 @@ class R2UploaderGUI(QMainWindow):
     def delete_directory(self, prefix):
         """删除目录及其所有内容 - 批量并发版本（带错误处理）"""
         try:
-            # 获取目录下所有对象
-            paginator = self.s3_client.get_paginator('list_objects_v2')
+            # 并发遍历并收集目录下所有对象（删除顺序无关紧要），同时记下各文件大小用于更新桶大小
             all_objects = []
-            
-            # 收集所有对象
-            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
-                if 'Contents' in page:
-                    all_objects.extend([{'Key': obj['Key']} for obj in page['Contents']])
+            object_sizes = {}
+            collect_lock = threading.Lock()
+
+            def collect(page):
+                contents = page.get('Contents', ())
+                keys = [{'Key': obj['Key']} for obj in contents]
+                sizes = {obj['Key']: obj['Size'] for obj in contents if not obj['Key'].endswith('/')}
+                with collect_lock:
+                    all_objects.extend(keys)
+                    object_sizes.update(sizes)
+
+            paginate_concurrently(self.s3_client, self.bucket_name, prefix, collect)
             
             total_objects = len(all_objects)
             if total_objects == 0:
@@ -1773,56 +1874,80 @@ class R2UploaderGUI(QMainWindow):
                 progress.setValue(0)
                 
                 deleted_objects = 0
+                deleted_bytes = 0
                 failed_objects = []
+                canceled = False
                 batch_size = 1000  # R2 API 限制：每次最多删除1000个对象
+                batches = [all_objects[i:i + batch_size] for i in range(0, total_objects, batch_size)]
+
+                def delete_batch(batch):
+                    # 批量删除，Quiet=True 时响应中只返回删除失败的对象
+                    response = self.s3_client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={'Objects': batch, 'Quiet': True}
+                    )
+                    return response.get('Errors', ())
                 
-                # 分批删除
-                for i in range(0, total_objects, batch_size):
-                    if progress.wasCanceled():
-                        self.show_result(
-                            f'⚠️ 删除操作已取消\n'
-                            f'已删除: {deleted_objects}/{total_objects} 个文件\n'
-                            f'失败: {len(failed_objects)} 个',
-                            True
-                        )
-                        return
-                    
-                    batch = all_objects[i:i + batch_size]
-                    batch_count = len(batch)
-                    
-                    try:
-                        # 批量删除
-                        response = self.s3_client.delete_objects(
-                            Bucket=self.bucket_name,
-                            Delete={'Objects': batch, 'Quiet': False}  # Quiet=False 返回详细结果
-                        )
-                        
-                        # 统计成功删除的数量
-                        if 'Deleted' in response:
-                            deleted_objects += len(response['Deleted'])
-                        
-                        # 记录失败的对象
-                        if 'Errors' in response:
-                            for error in response['Errors']:
+                # 各批次由线程池并发删除，界面线程按完成顺序汇总结果并更新进度
+                with ThreadPoolExecutor(max_workers=DELETE_MAX_WORKERS) as executor:
+                    futures = {executor.submit(delete_batch, batch): batch for batch in batches}
+                    for future in as_completed(futures):
+                        if future.cancelled():
+                            continue
+
+                        batch = futures[future]
+                        batch_count = len(batch)
+                        try:
+                            errors = future.result()
+
+                            # 统计成功删除的数量和字节数
+                            deleted_objects += batch_count - len(errors)
+                            deleted_bytes += sum(object_sizes.get(obj['Key'], 0) for obj in batch)
+                            deleted_bytes -= sum(object_sizes.get(error.get('Key'), 0) for error in errors)
+                            
+                            # 记录失败的对象
+                            for error in errors:
                                 failed_objects.append({
                                     'Key': error.get('Key', 'Unknown'),
                                     'Code': error.get('Code', 'Unknown'),
                                     'Message': error.get('Message', 'Unknown')
                                 })
+                            if errors:
+                                self.show_result(
+                                    f'⚠️ 本批次有 {len(errors)} 个文件删除失败，'
+                                    f'首个失败: {errors[0].get("Key", "Unknown")} - {errors[0].get("Message", "Unknown")}',
+                                    True
+                                )
+                            
+                        except Exception as e:
+                            # 批次删除失败，记录整个批次
+                            self.show_result(f'⚠️ 批次删除失败: {str(e)}', True)
+                            failed_objects.extend([{'Key': obj['Key'], 'Message': str(e)} for obj in batch])
                         
-                    except Exception as e:
-                        # 批次删除失败，记录整个批次
-                        self.show_result(f'⚠️ 批次删除失败: {str(e)}', True)
-                        failed_objects.extend([{'Key': obj['Key'], 'Error': str(e)} for obj in batch])
-                    
-                    # 更新进度
-                    progress.setValue(deleted_objects)
-                    progress.setLabelText(
-                        f"正在批量删除文件... ({deleted_objects}/{total_objects})\n"
-                        f"当前批次: {batch_count} 个文件\n"
-                        f"失败: {len(failed_objects)} 个"
+                        # 更新进度
+                        progress.setValue(deleted_objects)
+                        progress.setLabelText(
+                            f"正在批量删除文件... ({deleted_objects}/{total_objects})\n"
+                            f"当前批次: {batch_count} 个文件\n"
+                            f"失败: {len(failed_objects)} 个"
+                        )
+                        QApplication.processEvents()
+
+                        # 取消时丢弃尚未开始的批次，已在途的批次仍会完成并计入结果
+                        if not canceled and progress.wasCanceled():
+                            canceled = True
+                            for pending in futures:
+                                pending.cancel()
+
+                if canceled:
+                    self._adjust_bucket_size(-deleted_bytes)
+                    self.show_result(
+                        f'⚠️ 删除操作已取消\n'
+                        f'已删除: {deleted_objects}/{total_objects} 个文件\n'
+                        f'失败: {len(failed_objects)} 个',
+                        True
                     )
-                    QApplication.processEvents()
+                    return
                 
                 progress.close()
                 
@@ -1842,8 +1967,9 @@ class R2UploaderGUI(QMainWindow):
                         True
                     )
                 
-                # 刷新文件列表并更新桶大小
-                self.refresh_file_list(self.current_path, calculate_bucket_size=True)
+                # 按删除的字节数更新桶大小并刷新文件列表
+                self._adjust_bucket_size(-deleted_bytes)
+                self.refresh_file_list(self.current_path)
                 
         except Exception as e:
             self.show_result(f'❌ 删除目录失败：{str(e)}', True)
@@ -1851,66 +1977,94 @@ class R2UploaderGUI(QMainWindow):
     # 添加新的方法来处理快捷键操作
     def enter_selected_directory(self):
         """处理进入目录的快捷键"""
-        if self.stack_widget.currentIndex() == 0:  # 列表视图
-            item = self.file_list.currentItem()
-            if item and item.text(1) == '目录':
-                self.on_item_double_clicked(item)
-        else:  # 图标视图
-            item = self.icon_list.currentItem()
-            if item and item.data(Qt.ItemDataRole.UserRole + 1) == 'directory':
-                self.on_icon_double_clicked(item)
+        _, kind, object_key = self._current_selection()
+        if kind == 'directory':
+            self.refresh_file_list(object_key)
 
     def delete_selected_directory(self):
         """处理删除目录的快捷键"""
-        if self.stack_widget.currentIndex() == 0:  # 列表视图
-            item = self.file_list.currentItem()
-            if item and item.text(1) == '目录':
-                self.delete_directory(item.data(0, Qt.ItemDataRole.UserRole))
-        else:  # 图标视图
-            item = self.icon_list.currentItem()
-            if item and item.data(Qt.ItemDataRole.UserRole + 1) == 'directory':
-                self.delete_directory(item.data(Qt.ItemDataRole.UserRole))
+        _, kind, object_key = self._current_selection()
+        if kind == 'directory':
+            self.delete_directory(object_key)
+
+    def closeEvent(self, event):
+        """窗口关闭时确保线程正确退出"""
+        if self._is_uploading():
+            reply = QMessageBox.question(
+                self,
+                '确认退出',
+                '仍有文件正在上传，确定要退出吗？\n\n'
+                '尚未开始的文件将不再上传，正在上传的文件会在完成后退出。',
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+            # 不再启动新的上传
+            self.folder_pending_files.clear()
+            self.folder_upload_scan_thread = None
+
+        # 上传线程和文件夹遍历线程都以窗口为父对象，窗口销毁时会一并销毁，
+        # 必须先等待仍在运行的线程结束
+        for thread in self.findChildren(QThread):
+            thread.wait()
+
+        if self.bucket_size_thread and self.bucket_size_thread.isRunning():
+            # quit() 只在 calculate_bucket_size 返回后才生效，先让统计提前结束
+            self.bucket_size_pending = False
+            self.bucket_size_worker.cancel()
+            self.bucket_size_thread.quit()
+            self.bucket_size_thread.wait()
+        event.accept()
 
 # 添加一个新的 Worker 类来理后台计算
 class Worker(QObject):
     finished = pyqtSignal()
-    size_calculated = pyqtSignal(int)
+    # 桶大小可能超过 32 位整数范围，使用 object 传递 Python int
+    size_updated = pyqtSignal(object)  # 统计过程中的累计大小
+    size_calculated = pyqtSignal(object)
+    failed = pyqtSignal(str)
 
     def __init__(self, s3_client, bucket_name):
         super().__init__()
         self.s3_client = s3_client
         self.bucket_name = bucket_name
+        self.total_size = 0
+        self.lock = threading.Lock()
+        # 窗口关闭时设置，正在进行的统计尽快结束
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """取消正在进行的统计（可在其他线程中调用）"""
+        self.cancel_event.set()
 
     def calculate_bucket_size(self):
-        """计算桶的总大小"""
+        """计算桶的总大小（按键范围分片并发遍历）"""
         try:
-            total_size = 0
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            
-            # 遍历所有对象
-            for page in paginator.paginate(Bucket=self.bucket_name):
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        if not obj['Key'].endswith('/'):  # 排除目录
-                            file_size = obj['Size']
-                            total_size += file_size
-                            print(f"添加文件: {obj['Key']}, 大小: {file_size} bytes")  # 调试信息
-            
-            print(f"最终计算的总大小: {total_size} bytes")  # 调试信息
-            self.size_calculated.emit(total_size)
+            self.total_size = 0
+            paginate_concurrently(self.s3_client, self.bucket_name, '', self._add_page, self.cancel_event)
+            if not self.cancel_event.is_set():
+                self.size_calculated.emit(self.total_size)
             
         except Exception as e:
             print(f"计算桶大小时发生错误: {str(e)}")  # 添加错误日志
-            self.size_calculated.emit(0)  # 发送0表示计算失败
+            self.failed.emit(str(e))
         finally:
             self.finished.emit()
 
-    def closeEvent(self, event):
-        """窗口关闭时确保线程正确退出"""
-        if self.bucket_size_thread and self.bucket_size_thread.isRunning():
-            self.bucket_size_thread.quit()
-            self.bucket_size_thread.wait()
-        event.accept()
+    def _add_page(self, page):
+        """累加一页对象的大小，并发送累计大小"""
+        if self.cancel_event.is_set():
+            return
+        page_size = sum(
+            obj['Size'] for obj in page.get('Contents', ())
+            if not obj['Key'].endswith('/')  # 排除目录
+        )
+
+        with self.lock:
+            self.total_size += page_size
+            # 每页发送一次累计大小
+            self.size_updated.emit(self.total_size)
 
 def main():
     app = QApplication(sys.argv)